@@ -2,14 +2,20 @@
 Module containing the configuration base classes for configomatic.
 """
 
+import copy
 import functools
 import os
 import pathlib
+import re
+import threading
+import types
 import typing as t
+from stat import S_ISREG
 
 from pydantic import BaseModel
 
 from .exceptions import FileNotFound
+from .loader import Suffixes, parse_json
 from .loader import load_file as default_load_file
 from .utils import merge, snake_to_pascal
 
@@ -34,11 +40,74 @@ class ConfigEnvironmentDict(t.TypedDict, total=False):
     load_file: t.Callable[[str], dict[str, t.Any]] | None
     """The function to use to load the configuration file"""
 
+    cache_file: bool | None
+    """Whether to cache the parsed configuration file between instances"""
+
     env_prefix: str | None
     """The prefix to use for environment overrides"""
 
+    env_parse_json: bool | None
+    """Whether to parse the values of environment overrides as JSON where possible"""
+
+
+_config_env_keys = frozenset(ConfigEnvironmentDict.__annotations__.keys())
+
+
+@functools.lru_cache(maxsize=1024)
+def _split_env_var_name(name):
+    """
+    Splits the name of an environment variable, with the prefix removed, into the
+    lower-cased parts of the (possibly nested) item that it overrides.
+
+    The same names are seen every time a configuration is loaded, so the result
+    is cached.
+    """
+    return tuple(os.fsdecode(name).lower().split("__"))
+
+
+# Cache of parsed configuration files, keyed by the id of the load function and the
+# absolute path of the file
+# Each entry holds a reference to the load function, so its id cannot be reused by
+# another function while the entry exists
+_file_cache = {}
+_file_cache_size = 32
+# Configuration objects may be created from several threads, so changes to the
+# cache are made while holding a lock
+_file_cache_lock = threading.Lock()
 
-_config_env_keys = set(ConfigEnvironmentDict.__annotations__.keys())
+
+def _load_file_cached(load_file, path, stat):
+    """
+    Loads the configuration file at the given path using the given function.
+
+    The file is loaded again whenever its modification time or size changes.
+    """
+    key = (id(load_file), os.path.abspath(path))
+    signature = (stat.st_mtime_ns, stat.st_size)
+    entry = _file_cache.get(key)
+    if entry and entry[1] == signature:
+        return entry[2]
+    config = load_file(pathlib.Path(path)) or {}
+    with _file_cache_lock:
+        # Discard the oldest entry if the cache is full
+        if key not in _file_cache and len(_file_cache) >= _file_cache_size:
+            del _file_cache[next(iter(_file_cache))]
+        _file_cache[key] = (load_file, signature, config)
+    return config
+
+
+def _merge_sources(configs):
+    """
+    Merges the given configuration sources, with precedence from right to left.
+
+    Empty sources have nothing to contribute, and if only one source is left then
+    there is nothing to merge.
+    """
+    configs = [config for config in configs if config]
+    if len(configs) > 1:
+        return merge(*configs)
+    else:
+        return configs[0] if configs else {}
 
 
 class ConfigurationMeta(type(BaseModel)):
@@ -67,12 +136,29 @@ class ConfigurationMeta(type(BaseModel)):
         # Update the config environment with the keywords
         config_env.update(config_env_kwargs)
 
-        # Add the config env to the model attrs
-        # Add a classvar annotation so that Pydantic leaves it alone
-        attrs["config_env"] = config_env
-        attrs.setdefault("__annotations__", {})["config_env"] = t.ClassVar[
-            ConfigEnvironmentDict
-        ]
+        # Precompile a pattern matching the prefix, including the separator, that
+        # environment variables must have to be considered as overrides
+        # Where possible, the environment is screened as bytes so that the pattern
+        # must also be bytes
+        env_prefix = config_env.get("env_prefix")
+        if env_prefix and os.supports_bytes_environ:
+            env_var_pattern = re.compile(
+                re.escape(os.fsencode(env_prefix)) + b"__", re.IGNORECASE
+            )
+        elif env_prefix:
+            env_var_pattern = re.compile(f"{re.escape(env_prefix)}__", re.IGNORECASE)
+        else:
+            env_var_pattern = None
+
+        # Add the config env and env var pattern to the model attrs
+        # The config env is made read-only, as the values derived from it above
+        # would not reflect any later changes
+        # Add classvar annotations so that Pydantic leaves them alone
+        attrs["config_env"] = types.MappingProxyType(config_env)
+        attrs["_env_var_pattern"] = env_var_pattern
+        annotations = attrs.setdefault("__annotations__", {})
+        annotations["config_env"] = t.ClassVar[t.Mapping[str, t.Any]]
+        annotations["_env_var_pattern"] = t.ClassVar[re.Pattern | None]
 
         return super().__new__(cls, name, bases, attrs, **pydantic_kwargs)
 
@@ -89,6 +175,17 @@ class Configuration(
 
     config_env = ConfigEnvironmentDict()
 
+    @classmethod
+    def invalidate_cache(cls):
+        """
+        Discards any cached configuration files, forcing them to be loaded again.
+
+        The cache is shared by all configuration classes, so this discards the cached
+        files for every class and not just this one.
+        """
+        with _file_cache_lock:
+            _file_cache.clear()
+
     def __init__(self, _use_file=True, _path=None, _use_env=True, **init_kwargs):
         # Work out which configs to use
         configs = []
@@ -100,56 +197,121 @@ class Configuration(
             configs.append(self._load_environ())
         # The highest precedence is given to directly supplied keyword args
         configs.append(init_kwargs)
-        super().__init__(**merge(*configs))
+        super().__init__(**_merge_sources(configs))
+
+    @classmethod
+    def from_many(cls, kwargs_list, *, path=None, use_file=True, use_env=True):
+        """
+        Returns a configuration object for each set of keyword arguments in the list.
 
-    def _load_file(self, path):
+        The configuration file and environment variables are only loaded once and
+        are shared by all the objects, with each set of keyword arguments taking
+        precedence as usual.
+        """
+        configs = []
+        if use_file:
+            configs.append(cls._load_file(path))
+        if use_env:
+            configs.append(cls._load_environ())
+        shared = _merge_sources(configs)
+        # Each object gets its own copy of the shared config, so that objects do not
+        # share nested values with each other
+        return [
+            cls(
+                _use_file=False,
+                _use_env=False,
+                **_merge_sources([copy.deepcopy(shared), kwargs]),
+            )
+            for kwargs in kwargs_list
+        ]
+
+    @classmethod
+    def _load_file(cls, path):
         # If no path is given, try the environment variable
-        path_env_var = self.config_env.get("path_env_var")
+        path_env_var = cls.config_env.get("path_env_var")
         if not path and path_env_var:
             path = os.environ.get(path_env_var)
         # Any path found by this point is explicitly defined by the user
         explicit_path = bool(path)
         # If we have still not found a path, use the default
         if not path:
-            path = self.config_env.get("default_path")
-        # Load the specified configuration file
-        if path:
-            path = pathlib.Path(path)
-            if path.is_file():
-                load_file = self.config_env.get("load_file") or default_load_file
-                return load_file(path) or {}
-            elif explicit_path:
+            path = cls.config_env.get("default_path")
+        if not path:
+            return {}
+        # A single stat call tells us both whether the file exists and whether it has
+        # changed since it was last loaded
+        try:
+            stat = os.stat(path)
+        except (OSError, ValueError):
+            stat = None
+        if stat is None or not S_ISREG(stat.st_mode):
+            if explicit_path:
                 # If the file was explicitly specified by the user, require it to exist
                 raise FileNotFound(f"{path} does not exist")
             else:
                 # If no path was explicitly specified, don't require the default file to
                 # exist
                 return {}
-        else:
-            return {}
+        load_file = cls.config_env.get("load_file") or default_load_file
+        # Copying a cached JSON file is slower than parsing it again, so JSON files
+        # loaded with the default loader are never cached
+        if not cls.config_env.get("cache_file") or (
+            load_file is default_load_file
+            and pathlib.PurePath(path).suffix in Suffixes.JSON
+        ):
+            return load_file(pathlib.Path(path)) or {}
+        # Only parse the file if it has changed since it was last loaded
+        # The cached value is shared, so each caller gets a copy that it can modify
+        return copy.deepcopy(_load_file_cached(load_file, path, stat))
 
-    def _load_environ(self):
+    @classmethod
+    def _load_environ(cls):
         # Build a nested dict from environment variables with the specified prefix
         # Nesting is specified using __
+        # The pattern for the prefix is compiled when the class is defined
+        # Without a prefix, there is no way to tell which variables are intended as
+        # configuration overrides, so none are used
+        if not cls._env_var_pattern:
+            return {}
+        # Use a local variable as it is called for every variable
+        match_prefix = cls._env_var_pattern.match
+        # Where possible, screen the undecoded environment so that only the names and
+        # values of matching variables are decoded
+        environ = os.environb if os.supports_bytes_environ else os.environ
+        env_parse_json = cls.config_env.get("env_parse_json")
         env_vars = {}
-        env_prefix = self.config_env.get("env_prefix")
-        for env_var, env_val in os.environ.items():
+        # Iterate over the names only, and fetch the value once the name has matched
+        for env_var in environ:
+            # The variable must start with the prefix, which is otherwise thrown away
+            match = match_prefix(env_var)
+            if not match:
+                continue
             # Only consider non-empty environment variables
+            env_val = environ[env_var]
             if not env_val:
                 continue
-            env_var_parts = env_var.split("__")
-            # The first part must match the prefix, but is otherwise thrown away
-            if env_prefix:
-                if env_var_parts[0].upper() == env_prefix.upper():
-                    env_var_parts = env_var_parts[1:]
+            # The rest of the name gives the parts of the item to override
+            env_var_parts = _split_env_var_name(env_var[match.end() :])
+            env_val = os.fsdecode(env_val)
+            # If requested, values that are valid JSON are passed on as the parsed
+            # value, and all other values are passed on as strings
+            # A JSON null would be ignored when merging, so it is also kept as a string
+            if env_parse_json:
+                try:
+                    parsed_val = parse_json(env_val)
+                except ValueError:
+                    pass
                 else:
-                    continue
-            # The rest of the parts form a nested dictionary
-            nested_vars = functools.reduce(
-                lambda vars, part: vars.setdefault(part.lower(), {}),  # noqa: A006
-                env_var_parts[:-1],
-                env_vars,
-            )
+                    if parsed_val is not None:
+                        env_val = parsed_val
+            # Most variables set a top-level item, which needs no nesting
+            if len(env_var_parts) == 1:
+                env_vars[env_var_parts[0]] = env_val
+                continue
+            # Otherwise the rest of the parts form a nested dictionary
+            nested_vars = env_vars
+            for part in env_var_parts[:-1]:
+                nested_vars = nested_vars.setdefault(part, {})
             # With the final part, set the value
-            nested_vars[env_var_parts[-1].lower()] = env_val
+            nested_vars[env_var_parts[-1]] = env_val
         return env_vars
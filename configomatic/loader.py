@@ -1,64 +1,83 @@
+import functools
 import glob
+import importlib.util
 import json
 import pathlib
+import re
 
 try:
-    import yaml
+    import orjson
 
-    yaml_available = True
+    orjson_available = True
 except ImportError:
-    yaml_available = False
-
-try:
-    import toml
-
-    toml_available = True
-except ImportError:
-    toml_available = False
+    orjson_available = False
 
 from .exceptions import NoSuitableLoader, RequiredPackageNotAvailable
 from .utils import merge
 
-if yaml_available:
-    # If YAML is available, add support for inclusion tags to support loading
-    # configuration sections from other files
-
-    def include_constructor(loader, node):
-        """
-        Implements the "!include" tag.
-
-        We allow a single path or a comma-separated list of paths, where each path
-        is allowed to be a glob pattern. Paths can be explicitly excluded by prefixing
-        the path with "!".
-
-        Examples:
-
-          !include ./include.yaml
-          !include ./include1.yaml, include2.yaml
-          !include ./includes/*.yaml
-          !include ./includes/*.yaml, !./includes/excluded.yaml
-        """
-        paths = (path.strip() for path in loader.construct_scalar(node).split(","))
-        # We use glob rather than pathlib.Path.glob here as we don't know where in
-        # the path glob patterns will occur
-        included_paths = set()
-        excluded_paths = set()
-        for path in paths:
-            if path.startswith("!"):
-                excluded_paths.update(
-                    pathlib.Path(p).resolve()
-                    for p in glob.iglob(path[1:], recursive=True)
-                )
-            else:
-                included_paths.update(
-                    pathlib.Path(p).resolve() for p in glob.iglob(path, recursive=True)
-                )
-        # Merge the configs in sort order, so overrides are predictable
-        return merge(
-            *[load_file(path) for path in sorted(included_paths - excluded_paths)]
+# PyYAML and toml are comparatively slow to import, so we only check whether they
+# are available here and import them when a file of that type is first loaded
+yaml_available = importlib.util.find_spec("yaml") is not None
+toml_available = importlib.util.find_spec("toml") is not None
+
+
+# Separator for the paths in an include tag, including any surrounding whitespace
+_include_separator = re.compile(r"\s*,\s*")
+
+
+def include_constructor(loader, node):
+    """
+    Implements the "!include" tag.
+
+    We allow a single path or a comma-separated list of paths, where each path
+    is allowed to be a glob pattern. Paths can be explicitly excluded by prefixing
+    the path with "!".
+
+    Examples:
+
+      !include ./include.yaml
+      !include ./include1.yaml, include2.yaml
+      !include ./includes/*.yaml
+      !include ./includes/*.yaml, !./includes/excluded.yaml
+    """
+    paths = _include_separator.split(loader.construct_scalar(node).strip())
+    include_patterns = [path for path in paths if not path.startswith("!")]
+    exclude_patterns = [path[1:] for path in paths if path.startswith("!")]
+    # We use glob rather than pathlib.Path.glob here as we don't know where in
+    # the path glob patterns will occur
+    # Paths are resolved so that includes and exclusions that reach the same file
+    # through symlinks are recognised as the same
+    included_paths = set()
+    for pattern in include_patterns:
+        included_paths.update(
+            pathlib.Path(p).resolve() for p in glob.iglob(pattern, recursive=True)
         )
+    # Exclusions can only remove paths that were included, so there is no need to
+    # expand the exclusion patterns if nothing was included
+    if included_paths:
+        for pattern in exclude_patterns:
+            included_paths.difference_update(
+                pathlib.Path(p).resolve() for p in glob.iglob(pattern, recursive=True)
+            )
+    # Merge the configs in sort order, so overrides are predictable
+    return merge(*[load_file(path) for path in sorted(included_paths)])
+
+
+@functools.cache
+def _yaml_loader():
+    """
+    Imports PyYAML and returns the loader class to use for configuration files.
 
-    yaml.add_constructor("!include", include_constructor, Loader=yaml.SafeLoader)
+    The LibYAML-based loader is used if PyYAML was built with it, as it is much faster
+    than the pure-Python loader. Support for inclusion tags is added to support
+    loading configuration sections from other files.
+    """
+    import yaml
+
+    yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    for loader in {yaml.SafeLoader, yaml_loader}:
+        yaml.add_constructor("!include", include_constructor, Loader=loader)
+    return yaml_loader
 
 
 class Suffixes:
@@ -71,11 +90,28 @@ class Suffixes:
     TOML = [".toml"]  # noqa: RUF012
 
 
+def parse_json(data):
+    """
+    Parses the given JSON string.
+
+    If orjson is installed it is used to parse the data, otherwise the standard
+    library json module is used. orjson is stricter than the json module, e.g. it
+    rejects NaN and very large integers, so any data that it rejects is passed to
+    the json module to make sure the same data is accepted either way.
+    """
+    if orjson_available:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
 def load_json(fh):
     """
     Attempts to load configuration as JSON from the given file handle.
     """
-    return json.load(fh)
+    return parse_json(fh.read())
 
 
 def load_yaml(fh):
@@ -83,7 +119,9 @@ def load_yaml(fh):
     Attempts to load configuration as YAML from the given file handle.
     """
     if yaml_available:
-        return yaml.safe_load(fh)
+        import yaml
+
+        return yaml.load(fh, Loader=_yaml_loader())
     else:
         raise RequiredPackageNotAvailable("PyYAML must be installed to load YAML files")
 
@@ -93,6 +131,8 @@ def load_toml(fh):
     Attempts to load configuration as TOML from the given file handle.
     """
     if toml_available:
+        import toml
+
         return toml.load(fh)
     else:
         raise RequiredPackageNotAvailable("toml must be installed to load TOML files")
@@ -105,12 +145,15 @@ def load_file(path):
     This function will try various formats, based on the file suffix.
     The relevant libraries must be installed.
     """
+    # The suffixes and loaders are looked up on each call so that changes to them,
+    # e.g. additional suffixes, are respected
+    if path.suffix in Suffixes.JSON:
+        loader = load_json
+    elif path.suffix in Suffixes.YAML:
+        loader = load_yaml
+    elif path.suffix in Suffixes.TOML:
+        loader = load_toml
+    else:
+        raise NoSuitableLoader(f"no loader for suffix {path.suffix}")
     with path.open() as fh:
-        if path.suffix in Suffixes.JSON:
-            return load_json(fh)
-        elif path.suffix in Suffixes.YAML:
-            return load_yaml(fh)
-        elif path.suffix in Suffixes.TOML:
-            return load_toml(fh)
-        else:
-            raise NoSuitableLoader(f"no loader for suffix {path.suffix}")
+        return loader(fh)
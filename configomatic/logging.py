@@ -1,5 +1,6 @@
 import json
 import logging
+import logging.config
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -122,9 +123,14 @@ class LoggingConfiguration(BaseModel):
         """
         Apply the logging configuration.
         """
-        import logging.config
-
-        config = self.model_dump()
+        # The fields of this class hold plain dicts and scalars that dictConfig can
+        # consume directly, so there is no need to serialise the model first
+        # Neither merge nor dictConfig modify the dicts they are given
+        # Subclasses may add fields that need serialising, e.g. nested models
+        if type(self) is LoggingConfiguration:
+            config = self.__dict__
+        else:
+            config = self.model_dump()
         if overrides:
             config = merge(config, overrides)
         logging.config.dictConfig(config)
@@ -0,0 +1,172 @@
+import json
+import os
+import pathlib
+import tempfile
+import typing as t
+import unittest
+from unittest import mock
+
+from pydantic import Field
+
+from configomatic import Configuration
+
+
+def load_json_file(path):
+    # JSON files loaded with the default loader are never cached, so the cache tests
+    # use a custom loader
+    return json.loads(path.read_text())
+
+
+class TestFileCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = pathlib.Path(self.tmpdir.name) / "config.json"
+        self.write_config({"item": "first"})
+        self.addCleanup(Configuration.invalidate_cache)
+
+        class CachedConfig(
+            Configuration,
+            default_path=str(self.path),
+            load_file=load_json_file,
+            cache_file=True,
+        ):
+            item: str
+
+        self.config_cls = CachedConfig
+
+    def write_config(self, data, mtime_ns=None):
+        self.path.write_text(json.dumps(data))
+        if mtime_ns is not None:
+            os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_changed_file_is_loaded(self):
+        self.assertEqual(self.config_cls().item, "first")
+        self.write_config({"item": "changed"}, mtime_ns=self.path.stat().st_mtime_ns)
+        self.assertEqual(self.config_cls().item, "changed")
+
+    def test_invalidate_cache(self):
+        self.assertEqual(self.config_cls().item, "first")
+        # Keep the size and modification time the same so that the change is not
+        # detected without invalidating the cache
+        mtime_ns = self.path.stat().st_mtime_ns
+        self.write_config({"item": "other"}, mtime_ns=mtime_ns)
+        self.assertEqual(self.config_cls().item, "first")
+        Configuration.invalidate_cache()
+        self.assertEqual(self.config_cls().item, "other")
+
+    def test_json_is_not_cached_with_default_loader(self):
+        class JsonConfig(Configuration, default_path=str(self.path), cache_file=True):
+            item: str
+
+        self.assertEqual(JsonConfig().item, "first")
+        self.write_config({"item": "other"}, mtime_ns=self.path.stat().st_mtime_ns)
+        self.assertEqual(JsonConfig().item, "other")
+
+
+class TestEnvParseJson(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = pathlib.Path(self.tmpdir.name) / "config.json"
+        self.path.write_text(json.dumps({"options": {"from_file": 1}}))
+
+        class JsonConfig(
+            Configuration,
+            default_path=str(self.path),
+            env_prefix="CONFIGOMATIC_TEST",
+            env_parse_json=True,
+        ):
+            number: t.Any = None
+            flag: t.Any = None
+            text: t.Any = None
+            options: dict[str, t.Any] = Field(default_factory=dict)
+
+        self.config_cls = JsonConfig
+
+    def patch_environ(self, **env_vars):
+        patcher = mock.patch.dict(
+            os.environ,
+            {f"CONFIGOMATIC_TEST__{k.upper()}": v for k, v in env_vars.items()},
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_scalars_are_parsed(self):
+        self.patch_environ(number="123", flag="true", text='"quoted"')
+        config = self.config_cls()
+        self.assertEqual(config.number, 123)
+        self.assertIs(config.flag, True)
+        self.assertEqual(config.text, "quoted")
+
+    def test_objects_are_merged_with_file_config(self):
+        self.patch_environ(options='{"from_env": [1, 2]}')
+        config = self.config_cls()
+        self.assertEqual(config.options, {"from_file": 1, "from_env": [1, 2]})
+
+    def test_invalid_json_is_kept_as_string(self):
+        self.patch_environ(text="not json", number="{")
+        config = self.config_cls()
+        self.assertEqual(config.text, "not json")
+        self.assertEqual(config.number, "{")
+
+    def test_null_is_kept_as_string(self):
+        self.patch_environ(text="null")
+        self.assertEqual(self.config_cls().text, "null")
+
+    def test_off_by_default(self):
+        class StringConfig(Configuration, env_prefix="CONFIGOMATIC_TEST"):
+            number: t.Any = None
+            options: t.Any = None
+
+        self.patch_environ(number="123", options='{"a": 1}')
+        config = StringConfig()
+        self.assertEqual(config.number, "123")
+        self.assertEqual(config.options, '{"a": 1}')
+
+
+class TestFromMany(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.path = pathlib.Path(self.tmpdir.name) / "config.json"
+        self.path.write_text(
+            json.dumps({"item": "file", "options": {"nested": {"a": 1}}})
+        )
+        patcher = mock.patch.dict(os.environ, {"CONFIGOMATIC_TEST__ITEM": "env"})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        class ManyConfig(
+            Configuration,
+            default_path=str(self.path),
+            env_prefix="CONFIGOMATIC_TEST",
+        ):
+            item: str
+            options: dict[str, t.Any]
+            other: int = 0
+
+        self.config_cls = ManyConfig
+
+    def test_batch_construction(self):
+        kwargs_list = [{}, {"item": "kwarg"}, {"options": {"nested": {"b": 2}}}]
+        self.assertEqual(
+            self.config_cls.from_many(kwargs_list),
+            [self.config_cls(**kwargs) for kwargs in kwargs_list],
+        )
+
+    def test_batch_construction_without_sources(self):
+        kwargs_list = [{"item": "kwarg", "options": {}}, {"item": "x", "options": {}}]
+        self.assertEqual(
+            self.config_cls.from_many(kwargs_list, use_file=False, use_env=False),
+            [
+                self.config_cls(_use_file=False, _use_env=False, **kwargs)
+                for kwargs in kwargs_list
+            ],
+        )
+
+    def test_objects_do_not_share_values(self):
+        first, second = self.config_cls.from_many([{}, {}])
+        first.options["nested"]["a"] = -1
+        self.assertEqual(second.options, {"nested": {"a": 1}})
+        self.assertEqual(self.config_cls().options, {"nested": {"a": 1}})
@@ -0,0 +1,65 @@
+import math
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from configomatic import loader
+from configomatic.exceptions import NoSuitableLoader
+
+
+class TestLoadJson(unittest.TestCase):
+    def test_dialect_does_not_depend_on_orjson(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = pathlib.Path(tmpdir) / "config.json"
+            path.write_text('{"big": 123456789012345678901234567890, "n": NaN}')
+            config = loader.load_file(path)
+        self.assertEqual(config["big"], 123456789012345678901234567890)
+        self.assertTrue(math.isnan(config["n"]))
+
+    def test_invalid_json_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            loader.parse_json("{")
+
+
+@unittest.skipUnless(loader.yaml_available, "PyYAML is not installed")
+class TestYamlInclude(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.root = pathlib.Path(self.tmpdir.name)
+        (self.root / "inc").mkdir()
+        (self.root / "real").mkdir()
+
+    def test_exclusion_through_symlink(self):
+        (self.root / "inc" / "a.yaml").write_text("a: 1\n")
+        (self.root / "real" / "b.yaml").write_text("b: 2\n")
+        (self.root / "inc" / "b.yaml").symlink_to(self.root / "real" / "b.yaml")
+        path = self.root / "config.yaml"
+        path.write_text(
+            f'!include "{self.root}/inc/*.yaml, !{self.root}/real/b.yaml"\n'
+        )
+        self.assertEqual(loader.load_file(path), {"a": 1})
+
+
+class TestLoadFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_additional_suffix(self):
+        path = pathlib.Path(self.tmpdir.name) / "config.jsn"
+        path.write_text('{"a": 1}')
+        with mock.patch.object(loader.Suffixes, "JSON", [".json", ".jsn"]):
+            self.assertEqual(loader.load_file(path), {"a": 1})
+
+    def test_loader_can_be_patched(self):
+        path = pathlib.Path(self.tmpdir.name) / "config.json"
+        path.write_text('{"a": 1}')
+        with mock.patch.object(loader, "load_json", return_value={"b": 2}):
+            self.assertEqual(loader.load_file(path), {"b": 2})
+
+    def test_unknown_suffix(self):
+        path = pathlib.Path(self.tmpdir.name) / "config.ini"
+        with self.assertRaises(NoSuitableLoader):
+            loader.load_file(path)
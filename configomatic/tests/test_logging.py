@@ -0,0 +1,49 @@
+import logging
+import unittest
+
+from pydantic import BaseModel
+
+from configomatic.logging import LessThanLevelFilter, LoggingConfiguration
+
+
+class TestLessThanLevelFilter(unittest.TestCase):
+    def make_record(self, level):
+        return logging.LogRecord("test", level, "test.py", 1, "message", (), None)
+
+    def test_filter(self):
+        level_filter = LessThanLevelFilter("WARNING")
+        self.assertTrue(level_filter.filter(self.make_record(logging.INFO)))
+        self.assertFalse(level_filter.filter(self.make_record(logging.WARNING)))
+
+    def test_changing_level_is_respected(self):
+        level_filter = LessThanLevelFilter("WARNING")
+        level_filter.level = logging.ERROR
+        self.assertTrue(level_filter.filter(self.make_record(logging.WARNING)))
+
+
+class TestLoggingConfiguration(unittest.TestCase):
+    def setUp(self):
+        # Restore the root logger after each test, as applying the config changes it
+        root = logging.getLogger()
+        handlers, level = root.handlers[:], root.level
+
+        def restore():
+            root.handlers[:] = handlers
+            root.setLevel(level)
+
+        self.addCleanup(restore)
+
+    def test_apply(self):
+        LoggingConfiguration(loggers={"": {"level": "DEBUG"}}).apply()
+        self.assertEqual(logging.getLogger().level, logging.DEBUG)
+
+    def test_apply_subclass_with_model_field(self):
+        class RootLogger(BaseModel):
+            level: str = "ERROR"
+            handlers: list[str] = ["stderr"]
+
+        class SubConfiguration(LoggingConfiguration):
+            root: RootLogger = RootLogger()
+
+        SubConfiguration().apply()
+        self.assertEqual(logging.getLogger().level, logging.ERROR)
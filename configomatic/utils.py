@@ -1,30 +1,61 @@
 import functools
 
 
+@functools.lru_cache(maxsize=1024)
 def snake_to_pascal(name):
     """
     Converts a snake_case name to pascalCase.
+
+    The same field names are converted for every model that uses them, so the
+    result is cached.
     """
     first, *rest = name.split("_")
     return "".join([first] + [part.capitalize() for part in rest])
 
 
+# Sentinel for a key that is not present, as None is a valid value
+_missing = object()
+
+
 def merge(defaults, *overrides):
     """
     Returns a new dictionary obtained by deep-merging multiple sets of overrides
     into defaults, with precedence from right to left.
     """
 
-    def merge2(defaults, overrides):
-        if isinstance(defaults, dict) and isinstance(overrides, dict):
-            merged = defaults.copy()
+    # The dicts that were copied by this merge, keyed by id, which can be updated
+    # in place by later overrides without being copied again
+    # Holding a reference to each one means that the ids cannot be reused
+    copies = {}
+
+    def merge_into(merged, overrides):
+        # Nested dicts are merged using a stack rather than by recursion
+        # Each item is a dict that is a copy, and so can be updated in place, along
+        # with the overrides to merge into it
+        stack = [(merged, overrides)]
+        while stack:
+            merged, overrides = stack.pop()
             for key, value in overrides.items():
-                if key in defaults:
-                    merged[key] = merge2(defaults[key], value)
-                else:
+                # Fetch the existing value once rather than looking it up repeatedly
+                existing = merged.get(key, _missing)
+                if existing is _missing:
+                    merged[key] = value
+                elif isinstance(existing, dict) and isinstance(value, dict):
+                    if id(existing) not in copies:
+                        existing = merged[key] = existing.copy()
+                        copies[id(existing)] = existing
+                    stack.append((existing, value))
+                elif value is not None:
                     merged[key] = value
-            return merged
-        else:
-            return overrides if overrides is not None else defaults
 
-    return functools.reduce(merge2, overrides, defaults)
+    # Copy the top-level dict at most once, then merge each set of overrides into it
+    merged = defaults
+    for override in overrides:
+        if isinstance(merged, dict) and isinstance(override, dict):
+            if id(merged) not in copies:
+                merged = merged.copy()
+                copies[id(merged)] = merged
+            merge_into(merged, override)
+        elif override is not None:
+            merged = override
+    return merged